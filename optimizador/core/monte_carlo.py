@@ -0,0 +1,197 @@
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+import logging
+
+from .optimization_model import OptimizationModel
+
+logger = logging.getLogger(__name__)
+
+# Rondas máximas de remuestreo; con medias >= 0 cada ronda acepta al menos ~50% de lo pendiente
+_MAX_RESAMPLE_ROUNDS = 100
+
+class MonteCarloEvaluator:
+    """
+    MonteCarloEvaluator evalúa planes de producción bajo incertidumbre en precios y tiempos,
+    usando los datos de una sola fila de un DataFrame con el mismo formato que OptimizationModel.
+
+    Los precios y tiempos de producción se modelan como normales centradas en el valor del CSV,
+    con desviación estándar relativa (coeficiente de variación) y truncadas en 0 (los valores
+    negativos se vuelven a muestrear). Todos los
+    escenarios se evalúan a la vez con operaciones matriciales de NumPy:
+        ingresos = P @ X.T      (escenarios x planes)
+        uso_mk   = T_k @ X.T    (escenarios x planes)
+
+    Args:
+        df: DataFrame previamente validado.
+        price_cv: coeficiente de variación de los precios (float o dict por producto).
+        time_cv: coeficiente de variación de los tiempos (float o dict por producto).
+        n_samples: número de escenarios a simular.
+        seed: semilla del generador aleatorio.
+
+    Attributes:
+        products (List[str]): Lista de productos detectados.
+        capacity (Tuple[float, float]): Capacidades de las máquinas.
+        prices (np.ndarray): Escenarios de precios (n_samples x productos).
+        time1 (np.ndarray): Escenarios de tiempos en la máquina 1 (n_samples x productos).
+        time2 (np.ndarray): Escenarios de tiempos en la máquina 2 (n_samples x productos).
+
+    Methods:
+        evaluate(plans, quantiles, max_overflow) -> Dict[str, Any]:
+            Evalúa los planes y devuelve un diccionario con:
+                - n_samples: número de escenarios (int)
+                - plans: dict {nombre_plan: métricas}
+                - robust: nombre del plan más robusto (str)
+    """
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        price_cv: Any = 0.1,
+        time_cv: Any = 0.05,
+        n_samples: int = 100_000,
+        seed: Optional[int] = None,
+    ):
+        if n_samples <= 0:
+            raise ValueError("n_samples debe ser mayor que 0")
+
+        # Reutilizamos la extracción de parámetros del modelo determinista
+        base = OptimizationModel(df)
+        self.products = base.products
+        self.capacity = (base.cap1, base.cap2)
+        self.n_samples = n_samples
+        self._rng = np.random.default_rng(seed)
+
+        # Muestreo de escenarios, una columna por producto
+        self.prices = self._sample(base.prices, price_cv)
+        self.time1 = self._sample(base.time1, time_cv)
+        self.time2 = self._sample(base.time2, time_cv)
+        logger.info(f"Generados {n_samples} escenarios de precios y tiempos")
+
+    def _sample(self, means: Dict[str, float], cv: Any) -> np.ndarray:
+        """
+        Genera una matriz (n_samples x productos) de normales truncadas en 0: los valores
+        negativos se vuelven a muestrear en lugar de recortarse. Si tras _MAX_RESAMPLE_ROUNDS
+        rondas quedan negativos, se recortan a 0.
+
+        Raises:
+            ValueError si alguna media es negativa (la truncación en 0 no tendría sentido).
+        """
+        mu = np.array([means[p] for p in self.products])
+        if (mu < 0).any():
+            negative = [p for p, m in zip(self.products, mu) if m < 0]
+            raise ValueError(f"Los parámetros deben ser no negativos para los productos {negative}")
+        if isinstance(cv, dict):
+            cv = np.array([cv.get(p, 0.0) for p in self.products])
+        sigma = np.broadcast_to(np.abs(mu) * np.asarray(cv, dtype=float), mu.shape)
+        draws = self._rng.normal(mu, sigma, size=(self.n_samples, len(self.products)))
+
+        # Rechazo: remuestrear solo las celdas negativas, con un número acotado de rondas
+        negative = draws < 0
+        for _ in range(_MAX_RESAMPLE_ROUNDS):
+            if not negative.any():
+                break
+            cols = np.nonzero(negative)[1]
+            draws[negative] = self._rng.normal(mu[cols], sigma[cols])
+            negative = draws < 0
+        return np.clip(draws, 0.0, None)
+
+    def _plan_matrix(self, plans: Dict[str, Dict[str, int]]) -> np.ndarray:
+        """
+        Convierte los planes en una matriz (planes x productos).
+        """
+        return np.array(
+            [[float(plan.get(p, 0)) for p in self.products] for plan in plans.values()]
+        ).reshape(len(plans), len(self.products))
+
+    def evaluate(
+        self,
+        plans: Dict[str, Dict[str, int]],
+        quantiles: tuple = (0.05, 0.5, 0.95),
+        max_overflow: float = 0.05,
+    ) -> Dict[str, Any]:
+        """
+        Evalúa cada plan sobre todos los escenarios y devuelve:
+            - n_samples: número de escenarios
+            - quantiles: cuantiles evaluados, en orden ascendente
+            - plans: dict {nombre_plan: {plan, mean, quantiles, overflow_prob}}
+            - robust: plan con mayor ingreso en el cuantil más bajo entre los que no superan
+              max_overflow de probabilidad de exceder capacidad (si ninguno lo cumple, el de
+              menor probabilidad de exceso)
+
+        Raises:
+            ValueError si no se entrega ningún plan.
+        """
+        if not plans:
+            raise ValueError("Debe entregar al menos un plan a evaluar")
+
+        names = list(plans.keys())
+        quantiles = tuple(sorted(float(qq) for qq in quantiles))
+        X = self._plan_matrix(plans)
+
+        # Evaluación vectorizada: (n_samples x productos) @ (productos x planes)
+        revenue = self.prices @ X.T
+        used1 = self.time1 @ X.T
+        used2 = self.time2 @ X.T
+        overflow = (used1 > self.capacity[0]) | (used2 > self.capacity[1])
+        logger.info(f"Evaluados {len(names)} planes sobre {self.n_samples} escenarios")
+
+        q = np.quantile(revenue, quantiles, axis=0)
+        mean = revenue.mean(axis=0)
+        overflow_prob = overflow.mean(axis=0)
+
+        results = {}
+        for j, name in enumerate(names):
+            results[name] = {
+                "plan": dict(plans[name]),
+                "mean": float(mean[j]),
+                "quantiles": {qq: float(q[i, j]) for i, qq in enumerate(quantiles)},
+                "overflow_prob": float(overflow_prob[j]),
+            }
+
+        # Plan más robusto: mejor cuantil inferior (el primero, tras ordenar) entre los planes "seguros"
+        low = q[0]
+        safe = overflow_prob <= max_overflow
+        if safe.any():
+            best = int(np.argmax(np.where(safe, low, -np.inf)))
+        else:
+            best = int(np.lexsort((-low, overflow_prob))[0])
+
+        return {
+            "n_samples": self.n_samples,
+            "quantiles": list(quantiles),
+            "plans": results,
+            "robust": names[best],
+        }
+
+def neighbor_plans(solution: Dict[str, int], step: int = 1) -> Dict[str, Dict[str, int]]:
+    """
+    Genera planes candidatos alrededor de una solución, restando 0 o `step` unidades a cada
+    producto (sin bajar de 0). El primer plan es la propia solución, con nombre "optimo".
+    """
+    products = list(solution.keys())
+    plans = {"optimo": dict(solution)}
+    for deltas in itertools.product((0, step), repeat=len(products)):
+        if not any(deltas):
+            continue
+        plan = {p: max(solution[p] - d, 0) for p, d in zip(products, deltas)}
+        if plan in plans.values():
+            continue
+        name = ", ".join(f"{p}-{d}" for p, d in zip(products, deltas) if d)
+        plans[name] = plan
+    return plans
+
+def evaluate_solution(
+    df: pd.DataFrame,
+    solution: Dict[str, int],
+    candidates: Optional[Dict[str, Dict[str, int]]] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Atajo para evaluar la solución óptima junto a sus vecinos (o los candidatos entregados).
+    Los kwargs se pasan a MonteCarloEvaluator.
+    """
+    plans = neighbor_plans(solution)
+    if candidates:
+        plans.update(candidates)
+    return MonteCarloEvaluator(df, **kwargs).evaluate(plans)
@@ -0,0 +1,274 @@
+from pulp import LpProblem, LpMaximize, LpVariable, lpSum, LpStatus, LpSolution, value, PULP_CBC_CMD
+from pulp.constants import LpSolutionOptimal, LpSolutionIntegerFeasible
+import pandas as pd
+from typing import Any, Dict, List, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class MultiPeriodModel:
+    """
+    MultiPeriodModel planifica la producción de varios periodos (p. ej. días), donde cada fila del
+    DataFrame es un periodo con el mismo formato que OptimizationModel. Los periodos se enlazan con
+    restricciones de balance de inventario:
+        I[p, t] = I[p, t-1] + x[p, t] - s[p, t]
+
+    Columnas opcionales por producto:
+        Demand_Product_{p}: ventas máximas del periodo (sin límite si falta o es vacía).
+        Holding_Cost_Product_{p}: costo por unidad en inventario al cierre del periodo (0 si falta).
+
+    Max Z = Σ_t Σ_p (precio[p, t] * s[p, t] - costo_inv[p, t] * I[p, t])
+    s.a.    Σ_p tiempo_mk[p, t] * x[p, t] <= cap_mk[t]   para cada máquina k y periodo t
+
+    Args:
+        df: DataFrame previamente validado, una fila por periodo.
+        initial_inventory: inventario inicial por producto (por defecto 0).
+
+    Attributes:
+        periods (int): Número de periodos.
+        products (List[str]): Lista de productos detectados.
+        cap1, cap2 (List[float]): Capacidades de las máquinas por periodo.
+        prices, time1, time2, demand, holding (Dict[str, List]): Parámetros por producto y periodo.
+
+    Methods:
+        solve(mode, window, step, time_limit, gap_rel) -> Dict[str, Any]:
+            Resuelve el plan completo y devuelve un diccionario con:
+                - status: estado del solver de PuLP (str)
+                - solution_status: estado de la solución de PuLP, el peor entre ventanas (str)
+                - proven_optimal: True solo si el plan completo es un óptimo global probado (bool)
+                - mode: "rolling" o "monolithic" (str)
+                - plan: lista de dicts por periodo con production, sales, inventory y used
+                - objective: ingreso neto total (float)
+                - solves: número de modelos resueltos (int)
+                - elapsed: tiempo total de resolución en segundos (float)
+        optimality_gap(window, step, time_limit, gap_rel) -> Dict[str, Any]:
+            Resuelve en ambos modos y devuelve la brecha relativa del modo rolling.
+    """
+    def __init__(self, df: pd.DataFrame, initial_inventory: Optional[Dict[str, float]] = None):
+        if len(df) == 0:
+            raise ValueError("El DataFrame debe tener al menos un periodo")
+
+        self.periods = len(df)
+
+        # Capacidades de cada máquina por periodo
+        self.cap1 = [float(v) for v in df["Machine_1_Available_Hours"]]
+        self.cap2 = [float(v) for v in df["Machine_2_Available_Hours"]]
+
+        # Detectar productos
+        self.products = [c.replace("Price_Product_", "") for c in df.columns if c.startswith("Price_Product_")]
+
+        # Mapas de parámetros por producto y periodo
+        self.prices = {p: [float(v) for v in df[f"Price_Product_{p}"]] for p in self.products}
+        self.time1 = {p: [float(v) for v in df[f"Product_{p}_Production_Time_Machine_1"]] for p in self.products}
+        self.time2 = {p: [float(v) for v in df[f"Product_{p}_Production_Time_Machine_2"]] for p in self.products}
+        self.demand = {p: self._optional(df, f"Demand_Product_{p}", None) for p in self.products}
+        self.holding = {p: self._optional(df, f"Holding_Cost_Product_{p}", 0.0) for p in self.products}
+
+        initial_inventory = initial_inventory or {}
+        self.initial_inventory = {p: float(initial_inventory.get(p, 0.0)) for p in self.products}
+        logger.info(f"Modelo multiperiodo con {self.periods} periodos y productos {self.products}")
+
+    @staticmethod
+    def _optional(df: pd.DataFrame, col: str, default: Optional[float]) -> List[Optional[float]]:
+        """
+        Lee una columna opcional; valores faltantes toman el valor por defecto.
+        """
+        if col not in df.columns:
+            return [default] * len(df)
+        return [default if pd.isna(v) else float(v) for v in df[col]]
+
+    def _solve_window(
+        self,
+        start: int,
+        end: int,
+        inventory: Dict[str, float],
+        time_limit: Optional[float] = None,
+        gap_rel: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Construye y resuelve el modelo para los periodos [start, end) partiendo del inventario dado.
+        Con `time_limit` o `gap_rel` el solver puede detenerse con una solución factible no
+        probada como óptima; se informa en `solution_status`.
+
+        Raises:
+            RuntimeError si el solver no encuentra ninguna solución factible.
+        """
+        T = range(start, end)
+        model = LpProblem(f"Multi_Period_{start}_{end}", LpMaximize)
+
+        # Variables: producción (entera), ventas e inventario al cierre del periodo
+        x = {(p, t): LpVariable(f"x_{p}_{t}", lowBound=0, cat="Integer") for p in self.products for t in T}
+        s = {(p, t): LpVariable(f"s_{p}_{t}", lowBound=0, upBound=self.demand[p][t]) for p in self.products for t in T}
+        inv = {(p, t): LpVariable(f"I_{p}_{t}", lowBound=0) for p in self.products for t in T}
+
+        # Objetivo: ingresos por ventas menos costo de inventario
+        model += lpSum(
+            self.prices[p][t] * s[p, t] - self.holding[p][t] * inv[p, t] for p in self.products for t in T
+        ), "Objetivo"
+
+        for t in T:
+            # Capacidad de cada máquina en el periodo
+            model += (lpSum(self.time1[p][t] * x[p, t] for p in self.products) <= self.cap1[t], f"Capacidad_M1_{t}")
+            model += (lpSum(self.time2[p][t] * x[p, t] for p in self.products) <= self.cap2[t], f"Capacidad_M2_{t}")
+
+            # Balance de inventario
+            for p in self.products:
+                previous = inventory[p] if t == start else inv[p, t - 1]
+                model += (previous + x[p, t] - s[p, t] == inv[p, t], f"Balance_{p}_{t}")
+
+        status = LpStatus[model.solve(PULP_CBC_CMD(msg=False, timeLimit=time_limit, gapRel=gap_rel))]
+        if model.sol_status not in (LpSolutionOptimal, LpSolutionIntegerFeasible):
+            raise RuntimeError(
+                f"Solver no encontró solución en periodos {start}-{end - 1}: "
+                f"{status} ({LpSolution[model.sol_status]})"
+            )
+        if model.sol_status != LpSolutionOptimal:
+            logger.warning(
+                f"Periodos {start}-{end - 1}: solución no probada como óptima ({LpSolution[model.sol_status]})"
+            )
+
+        plan = []
+        for t in T:
+            production = {p: int(round(x[p, t].value() or 0)) for p in self.products}
+            plan.append({
+                "period": t,
+                "production": production,
+                "sales": {p: float(s[p, t].value() or 0) for p in self.products},
+                "inventory": {p: float(inv[p, t].value() or 0) for p in self.products},
+                "used": (
+                    sum(self.time1[p][t] * production[p] for p in self.products),
+                    sum(self.time2[p][t] * production[p] for p in self.products),
+                ),
+            })
+        return {
+            "status": status,
+            "sol_status": model.sol_status,
+            "plan": plan,
+            "objective": value(model.objective) or 0.0,
+        }
+
+    def _period_value(self, period: Dict[str, Any]) -> float:
+        """
+        Ingreso neto de un periodo ya resuelto.
+        """
+        t = period["period"]
+        return sum(
+            self.prices[p][t] * period["sales"][p] - self.holding[p][t] * period["inventory"][p]
+            for p in self.products
+        )
+
+    def solve(
+        self,
+        mode: str = "rolling",
+        window: int = 14,
+        step: int = 7,
+        time_limit: Optional[float] = None,
+        gap_rel: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Resuelve el plan de todos los periodos.
+
+        Modos:
+            - "monolithic": un único MIP con todos los periodos (óptimo global).
+            - "rolling": horizonte rodante; se resuelven ventanas de `window` periodos, se fijan las
+              decisiones de los primeros `step` y la siguiente ventana parte del inventario resultante.
+              Las ventanas se traslapan en `window - step` periodos, de modo que cada decisión fijada
+              considera lo que viene después. El tiempo crece linealmente con el horizonte.
+
+        `time_limit` (segundos) y `gap_rel` se pasan a CBC en cada modelo resuelto (en modo rolling,
+        por ventana). Si el solver se detiene antes de probar optimalidad, `solution_status` lo
+        indica y `proven_optimal` es False.
+
+        Raises:
+            ValueError si el modo o los parámetros de la ventana no son válidos.
+            RuntimeError si el solver no encuentra ninguna solución factible.
+        """
+        if mode not in ("rolling", "monolithic"):
+            raise ValueError(f"Modo desconocido: {mode}")
+        if mode == "rolling" and not 1 <= step <= window:
+            raise ValueError("Se requiere 1 <= step <= window")
+
+        started = time.perf_counter()
+        if mode == "monolithic":
+            logger.info(f"Resolviendo modelo monolítico de {self.periods} periodos...")
+            result = self._solve_window(0, self.periods, self.initial_inventory, time_limit, gap_rel)
+            plan, solves = result["plan"], 1
+            status, sol_status = result["status"], result["sol_status"]
+        else:
+            logger.info(f"Resolviendo horizonte rodante (ventana={window}, paso={step})...")
+            plan, solves = [], 0
+            status, sol_status = "Optimal", LpSolutionOptimal
+            inventory = dict(self.initial_inventory)
+            start = 0
+            while start < self.periods:
+                end = min(start + window, self.periods)
+                result = self._solve_window(start, end, inventory, time_limit, gap_rel)
+                solves += 1
+                if result["status"] != "Optimal":
+                    status = result["status"]
+                if result["sol_status"] != LpSolutionOptimal:
+                    sol_status = result["sol_status"]
+
+                # Fijar los primeros `step` periodos (o todos si es la última ventana)
+                fixed = result["plan"] if end == self.periods else result["plan"][:step]
+                plan.extend(fixed)
+                inventory = dict(fixed[-1]["inventory"])
+                start += len(fixed)
+
+        elapsed = time.perf_counter() - started
+        total = sum(self._period_value(period) for period in plan)
+        logger.info(f"Plan multiperiodo resuelto en {elapsed:.2f}s con {solves} modelos")
+
+        return {
+            "status": status,
+            "solution_status": LpSolution[sol_status],
+            "proven_optimal": mode == "monolithic" and sol_status == LpSolutionOptimal,
+            "mode": mode,
+            "plan": plan,
+            "objective": total,
+            "solves": solves,
+            "elapsed": elapsed,
+        }
+
+    def optimality_gap(
+        self,
+        window: int = 14,
+        step: int = 7,
+        time_limit: Optional[float] = None,
+        gap_rel: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Resuelve en modo monolítico y rodante y devuelve:
+            - monolithic: resultado monolítico
+            - rolling: resultado rodante
+            - baseline_optimal: si el monolítico es un óptimo probado
+            - gap: brecha relativa (monolítico - rodante) / |monolítico|, o None si el monolítico
+              no es un óptimo probado (p. ej. por `time_limit` o `gap_rel`)
+            - incumbent_gap: la misma brecha medida contra la mejor solución monolítica encontrada,
+              aunque no sea óptima
+
+        `time_limit` y `gap_rel` se aplican al modelo monolítico para que la medición no bloquee
+        indefinidamente en instancias difíciles.
+        """
+        monolithic = self.solve("monolithic", time_limit=time_limit, gap_rel=gap_rel)
+        rolling = self.solve("rolling", window=window, step=step)
+        best = monolithic["objective"]
+        incumbent_gap = (best - rolling["objective"]) / abs(best) if best else 0.0
+        baseline_optimal = monolithic["proven_optimal"]
+
+        if baseline_optimal:
+            logger.info(f"Brecha de optimalidad del horizonte rodante: {incumbent_gap:.4%}")
+        else:
+            logger.warning(
+                f"Monolítico sin óptimo probado ({monolithic['solution_status']}); "
+                f"brecha contra la mejor solución encontrada: {incumbent_gap:.4%}"
+            )
+
+        return {
+            "monolithic": monolithic,
+            "rolling": rolling,
+            "baseline_optimal": baseline_optimal,
+            "gap": incumbent_gap if baseline_optimal else None,
+            "incumbent_gap": incumbent_gap,
+        }
@@ -1,6 +1,9 @@
-from pulp import LpProblem, LpMaximize, LpVariable, lpSum, LpStatus, value
+from pulp import LpProblem, LpMaximize, LpVariable, lpSum, LpStatus, value, PULP_CBC_CMD
 import pandas as pd
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+from bisect import bisect_right
+import numpy as np
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,6 +42,14 @@ class OptimizationModel:
                 - objective: ingreso total óptimo (float)
                 - capacity: tuple con capacidades de las máquinas (float, float)
                 - used: tuple con horas usadas de las máquinas (float, float)
+
+        frontier(max_solves, time_budget) -> Dict[str, Any]:
+            Calcula la frontera de Pareto exacta (ingreso vs. uso de máquinas) con el método
+            epsilon-restricción y devuelve un diccionario con:
+                - points: lista de planes no dominados
+                - solved: número de resoluciones del solver (int)
+                - skipped: número de pasos omitidos (int)
+                - complete: False si se alcanzó el tope de resoluciones o de tiempo (bool)
     """
     def __init__(self, df: pd.DataFrame):
 
@@ -69,6 +80,8 @@ class OptimizationModel:
         self.vars = {p: LpVariable(f"x_{p}", lowBound=0, cat="Integer") for p in self.products}
         logger.info("Variables de decisión creadas")
 
+        self._built = False
+
     def _build_objective(self):
         """
         Función para maximizar ingresos diarios
@@ -86,6 +99,17 @@ class OptimizationModel:
 
         logger.info("Restricciones añadidas")
 
+    def _build(self):
+        """
+        Construye objetivo y restricciones una sola vez, para poder resolver el modelo varias veces.
+        """
+        if self._built:
+            return
+        logger.info("Construyendo el modelo de optimización...")
+        self._build_objective()
+        self._add_constraints()
+        self._built = True
+
     def solve(self) -> Dict[str, Any]:
         """
         Resuelve el modelo y devuelve:
@@ -96,9 +120,7 @@ class OptimizationModel:
             RuntimeError si no encuentra solutión óptima o no se obtuvo el valor para una variable.
         """
         # Utilizamos las funciones privadas para construir el modelo
-        logger.info("Construyendo el modelo de optimización...")
-        self._build_objective()
-        self._add_constraints()
+        self._build()
         
         # Resolvemos el modelo
         logger.info("Resolviendo modelo...")
@@ -131,4 +153,162 @@ class OptimizationModel:
             "objective": total,
             "capacity": (self.cap1, self.cap2),
             "used": (used1, used2)
-        }
\ No newline at end of file
+        }
+
+    def _usage(self, solution: Dict[str, int]) -> tuple:
+        """
+        Horas usadas en cada máquina por un plan.
+        """
+        used1 = sum(self.time1[p] * solution[p] for p in self.products)
+        used2 = sum(self.time2[p] * solution[p] for p in self.products)
+        return used1, used2
+
+    def frontier(self, max_solves: int = 1000, time_budget: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Calcula la frontera de Pareto exacta (max ingreso, min uso M1, min uso M2) con el método
+        epsilon-restricción anidado:
+            - Bucle externo: limita el uso de M2 a eps2 (parte en cap2).
+            - Bucle interno: limita el uso de M1 a eps1 (parte en cap1), maximiza el ingreso y fija
+              el siguiente eps1 justo bajo el uso de M1 del plan encontrado, hasta que el plan no
+              use M1 (ingreso 0) o el modelo sea infactible.
+            - El siguiente eps2 queda justo bajo el mayor uso de M2 de los planes del bucle interno.
+
+        El modelo se construye una vez y solo se actualiza el lado derecho de las restricciones
+        de capacidad entre pasos. Como las cotas solo bajan, la región factible se achica: si un
+        plan resuelto con cotas mayores o iguales sigue siendo factible, sigue siendo óptimo y el
+        paso se omite sin llamar al solver.
+
+        Para evitar planes débilmente dominados (mismo ingreso con más horas de máquina) se
+        penaliza levemente el uso de máquinas en el objetivo (epsilon-restricción aumentada).
+
+        Args:
+            max_solves: tope de resoluciones del solver; si se alcanza, la frontera queda
+                incompleta y `complete` es False.
+            time_budget: tiempo máximo (segundos) del barrido; si se agota, `complete` es False.
+
+        Returns:
+            Dict con:
+                - points: lista de dicts {solution, objective, used, utilization} no dominados,
+                  ordenados por ingreso descendente
+                - solved: número de resoluciones del solver
+                - skipped: número de pasos omitidos
+                - complete: False si se alcanzó max_solves o time_budget
+
+        Raises:
+            RuntimeError si el solver no encuentra solución óptima en algún paso factible.
+        """
+        self._build()
+        revenue = lpSum(self.prices[p] * self.vars[p] for p in self.products)
+        usage = lpSum((self.time1[p] + self.time2[p]) * self.vars[p] for p in self.products)
+
+        # Penalización pequeña frente a la menor diferencia relevante de ingreso
+        max_time = max([self.time1[p] + self.time2[p] for p in self.products] + [1.0])
+        min_price = min([v for v in self.prices.values() if v > 0] or [1.0])
+        rho = 1e-6 * min_price / max_time
+        self.model.setObjective(revenue - rho * usage)
+
+        # Paso "justo bajo" el uso encontrado; menor que la resolución de los tiempos de producción
+        delta = 1e-4
+
+        c1 = self.model.constraints["Capacidad_M1"]
+        c2 = self.model.constraints["Capacidad_M2"]
+        solver = PULP_CBC_CMD(msg=False)
+        solved = skipped = 0
+        complete = True
+
+        # Planes encontrados, como tuplas de cantidades en el orden de self.products
+        found: Dict[tuple, tuple] = {}
+        # Bucle interno anterior (eps2 mayor): cotas eps1 negadas (orden ascendente) y, por
+        # posición, el uso (M1, M2) del plan correspondiente
+        prev_neg_eps: List[float] = []
+        prev_used: List[tuple] = []
+        started = time.perf_counter()
+        try:
+            eps2 = self.cap2
+            while eps2 >= 0 and complete:
+                row_neg_eps: List[float] = []
+                row_used: List[tuple] = []
+                eps1 = self.cap1
+                while eps1 >= 0:
+                    # Omitir si el plan del bucle anterior con la menor cota eps1' >= eps1 sigue
+                    # siendo factible: los planes con cotas mayores usan más de eps1 en M1
+                    used = None
+                    i = bisect_right(prev_neg_eps, -eps1) - 1
+                    if i >= 0 and prev_used[i][0] <= eps1 + 1e-9 and prev_used[i][1] <= eps2 + 1e-9:
+                        used = prev_used[i]
+
+                    if used is not None:
+                        skipped += 1
+                    else:
+                        if solved >= max_solves:
+                            complete = False
+                            logger.warning(f"Frontera incompleta: se alcanzó el tope de {max_solves} resoluciones")
+                            break
+                        if time_budget is not None and time.perf_counter() - started > time_budget:
+                            complete = False
+                            logger.warning(f"Frontera incompleta: se agotó el tiempo de {time_budget}s")
+                            break
+                        c1.constant = -eps1
+                        c2.constant = -eps2
+                        status = LpStatus[self.model.solve(solver)]
+                        solved += 1
+                        if status == "Infeasible":
+                            break
+                        if status != "Optimal":
+                            raise RuntimeError(f"Solver no encontró solución óptima: {status}")
+
+                        solution = {}
+                        for p in self.products:
+                            val = self.vars[p].value()
+                            if val is None:
+                                raise RuntimeError(f"No se obtuvo valor para la variable de producto '{p}'")
+                            solution[p] = int(round(val))
+                        used = self._usage(solution)
+                        found.setdefault(tuple(solution[p] for p in self.products), used)
+
+                    row_neg_eps.append(-eps1)
+                    row_used.append(used)
+
+                    # Siguiente cota de M1 justo bajo el uso del plan encontrado
+                    if used[0] <= 0:
+                        break
+                    eps1 = used[0] - delta
+
+                if not row_used:
+                    break
+                # Siguiente cota de M2 justo bajo el mayor uso de M2 del bucle interno
+                max_used2 = max(u[1] for u in row_used)
+                if max_used2 <= 0:
+                    break
+                eps2 = max_used2 - delta
+                prev_neg_eps, prev_used = row_neg_eps, row_used
+        finally:
+            # Restaurar el modelo original
+            c1.constant = -self.cap1
+            c2.constant = -self.cap2
+            self.model.setObjective(revenue)
+        logger.info(f"Frontera calculada: {solved} resoluciones, {skipped} pasos omitidos")
+
+        # Filtrar planes no dominados (vectorizado: max ingreso, min uso M1, min uso M2)
+        keys = list(found.keys())
+        rev = np.array([sum(self.prices[p] * q for p, q in zip(self.products, k)) for k in keys])
+        u1 = np.array([found[k][0] for k in keys])
+        u2 = np.array([found[k][1] for k in keys])
+        points: List[Dict[str, Any]] = []
+        for i, k in enumerate(keys):
+            weakly = (rev >= rev[i]) & (u1 <= u1[i]) & (u2 <= u2[i])
+            strictly = (rev > rev[i]) | (u1 < u1[i]) | (u2 < u2[i])
+            if (weakly & strictly).any():
+                continue
+            points.append({
+                "solution": dict(zip(self.products, k)),
+                "objective": float(rev[i]),
+                "used": found[k],
+                "utilization": (
+                    found[k][0] / self.cap1 if self.cap1 else 0.0,
+                    found[k][1] / self.cap2 if self.cap2 else 0.0,
+                ),
+            })
+        points.sort(key=lambda c: (-c["objective"], c["used"][1], c["used"][0]))
+
+        return {"points": points, "solved": solved, "skipped": skipped, "complete": complete}
\ No newline at end of file
@@ -0,0 +1,360 @@
+import os
+import html
+import json
+import time
+import base64
+import atexit
+import binascii
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Firma de los archivos PNG, para validar gráficos leídos desde caché
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Pool de procesos compartido por todos los reportes del proceso actual (protegido por _pool_lock)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid = 0
+_pool_lock = threading.Lock()
+
+def _init_worker():
+    """
+    Inicializa matplotlib una sola vez por proceso del pool (backend sin pantalla).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+
+def _render_chart(raw: Dict[str, Any]) -> str:
+    """
+    Renderiza el gráfico de un resultado en un proceso del pool.
+    """
+    from .results_handler import ResultsHandler
+    return ResultsHandler(raw).get_chart_base64()
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Devuelve el pool del proceso actual, creándolo la primera vez (o si el proceso fue
+    bifurcado, p. ej. por un worker de gunicorn). Así matplotlib se inicializa una vez por
+    proceso del pool y no en cada reporte.
+
+    `max_workers` solo se usa al crear el pool: un pool existente se reutiliza aunque se pida
+    otro tamaño, ya que otro hilo puede estar enviándole trabajos.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+            _pool_pid = os.getpid()
+            logger.info(f"Pool de gráficos creado con {max_workers} procesos")
+        return _pool
+
+def _discard_pool(pool: Optional[ProcessPoolExecutor] = None):
+    """
+    Descarta el pool actual si es `pool` (o cualquiera, si no se indica), p. ej. porque un
+    proceso murió y el pool quedó roto. Si otro hilo ya lo reemplazó, no hace nada.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or (pool is not None and _pool is not pool):
+            return
+        if _pool_pid == os.getpid():
+            _pool.shutdown(wait=False)
+        _pool = None
+
+atexit.register(_discard_pool)
+
+def chart_key(raw: Dict[str, Any]) -> str:
+    """
+    Hash de los campos que determinan el gráfico (solución, uso y capacidad),
+    usado para omitir gráficos de resultados que no cambiaron.
+    """
+    payload = json.dumps(
+        {
+            "solution": raw["solution"],
+            "used": list(raw["used"]),
+            "capacity": list(raw["capacity"]),
+        },
+        sort_keys=True,
+        default=float,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _is_png_base64(chart: str) -> bool:
+    """
+    Verifica que el texto sea base64 válido de una imagen PNG.
+    """
+    try:
+        return base64.b64decode(chart, validate=True).startswith(_PNG_SIGNATURE)
+    except (binascii.Error, ValueError):
+        return False
+
+class BulkReportBuilder:
+    """
+    BulkReportBuilder genera un reporte HTML único (autocontenido) con una sección por escenario:
+    estado, cantidades óptimas, ingreso y el gráfico de ResultsHandler.
+
+    Los gráficos se renderizan en un pool de procesos compartido por el proceso actual (se crea
+    una vez y matplotlib se configura una vez por proceso del pool) y cada sección se escribe a
+    disco apenas está lista, en el orden de entrada. Solo se mantienen en memoria `max_pending`
+    escenarios a la vez, por lo que el uso de memoria no depende del número de escenarios.
+
+    Args:
+        output_path: ruta del archivo HTML a generar.
+        max_workers: número de procesos del pool (por defecto, min(os.cpu_count(), 4)).
+        max_pending: máximo de gráficos en vuelo (por defecto, 2 * max_workers).
+        cache_dir: carpeta opcional donde se guardan los gráficos por hash; si el resultado de un
+            escenario no cambió, su gráfico se lee desde ahí en vez de renderizarse. Los valores
+            que no sean PNG en base64 válido se descartan.
+        cache_max_bytes: tamaño máximo de la caché; al terminar se eliminan los más antiguos.
+        cache_max_age: antigüedad máxima (segundos) de un gráfico en caché.
+
+    Methods:
+        build(scenarios) -> Dict[str, Any]:
+            Genera el reporte y devuelve un diccionario con:
+                - path: ruta del reporte (str)
+                - scenarios: número de escenarios escritos (int)
+                - rendered: gráficos renderizados (int)
+                - cached: gráficos leídos desde caché (int)
+                - deduplicated: escenarios que compartieron un gráfico en vuelo (int)
+                - failed: escenarios escritos como sección de error (int)
+    """
+    def __init__(
+        self,
+        output_path: str,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: Optional[int] = None,
+        cache_max_age: Optional[float] = None,
+    ):
+        self.output_path = output_path
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 4)
+        self.max_pending = max_pending or 2 * self.max_workers
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_age = cache_max_age
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    def _cache_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.b64") if self.cache_dir else None
+
+    def _read_cache(self, key: str) -> Optional[str]:
+        path = self._cache_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        if self.cache_max_age is not None and time.time() - os.path.getmtime(path) > self.cache_max_age:
+            return None
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                chart = f.read()
+        except (OSError, UnicodeDecodeError):
+            chart = ""
+        if not _is_png_base64(chart):
+            logger.warning(f"Gráfico en caché inválido, se descarta: {path}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return chart
+
+    def _write_cache(self, key: str, chart: str):
+        path = self._cache_path(key)
+        if path:
+            # Escritura atómica para no dejar archivos a medias en caché
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="ascii") as f:
+                f.write(chart)
+            os.replace(tmp, path)
+
+    def _prune_cache(self):
+        """
+        Elimina de la caché los gráficos vencidos y, si se supera el tamaño máximo,
+        los más antiguos hasta quedar bajo el límite.
+        """
+        if not self.cache_dir or (self.cache_max_bytes is None and self.cache_max_age is None):
+            return
+        now = time.time()
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".b64"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            expired = self.cache_max_age is not None and now - mtime > self.cache_max_age
+            oversized = self.cache_max_bytes is not None and total > self.cache_max_bytes
+            if not (expired or oversized):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Caché de gráficos depurada: {removed} archivos eliminados")
+
+    def _write_section(self, out, name: str, raw: Dict[str, Any], chart: Optional[str]):
+        """
+        Escribe la sección HTML de un escenario (o su error, si el resultado trae `error`).
+        """
+        if "error" in raw:
+            out.write(
+                f'<section class="scenario error">\n'
+                f"<h2>{html.escape(str(name))}</h2>\n"
+                f"<p><strong>Error:</strong> {html.escape(str(raw['error']))}</p>\n"
+                f"</section>\n"
+            )
+            return
+        items = "".join(
+            f"<li>{html.escape(str(p))}: {q} unidades</li>" for p, q in raw["solution"].items()
+        )
+        used1, used2 = raw["used"]
+        cap1, cap2 = raw["capacity"]
+        out.write(
+            f'<section class="scenario">\n'
+            f"<h2>{html.escape(str(name))}</h2>\n"
+            f"<p><strong>Estado:</strong> {html.escape(str(raw['status']))}</p>\n"
+            f"<ul>{items}</ul>\n"
+            f'<p class="objective">Ingreso Total: ${raw["objective"]}</p>\n'
+            f"<p>Uso M1: {used1} / {cap1} h &middot; Uso M2: {used2} / {cap2} h</p>\n"
+            f'<img class="chart" src="data:image/png;base64,{html.escape(chart)}" alt="Gráfico {html.escape(str(name))}" />\n'
+            f"</section>\n"
+        )
+
+    def build(self, scenarios: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Genera el reporte a partir de pares (nombre, resultado de OptimizationModel.solve()).
+        `scenarios` puede ser un generador; se consume de forma incremental. Un resultado de la
+        forma {"error": mensaje} se escribe como sección de error sin gráfico. Si algo falla,
+        se elimina el archivo parcial y se relanza la excepción.
+
+        Returns:
+            Dict con path, scenarios, rendered, cached, deduplicated y failed.
+
+        Raises:
+            KeyError si algún resultado no tiene las claves mínimas.
+        """
+        written = rendered = cached = deduplicated = failed = 0
+        tmp_path = f"{self.output_path}.tmp"
+        logger.info(f"Generando reporte en {self.output_path} con {self.max_workers} procesos")
+
+        pool = _get_pool(self.max_workers)
+        # Ventana deslizante: (nombre, resultado, clave, future o gráfico en caché)
+        pending = deque()
+        # Gráficos en vuelo por clave, para no renderizar dos veces el mismo resultado
+        inflight = {}
+
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                out.write(_HEADER)
+
+                def flush_one():
+                    nonlocal written
+                    name, raw, key, job = pending.popleft()
+                    if job is None or isinstance(job, str):
+                        chart = job
+                    else:
+                        chart = job.result()
+                        if inflight.get(key) is job:
+                            del inflight[key]
+                            self._write_cache(key, chart)
+                    self._write_section(out, name, raw, chart)
+                    written += 1
+
+                for name, raw in scenarios:
+                    if "error" in raw:
+                        pending.append((name, raw, None, None))
+                        failed += 1
+                        while len(pending) > self.max_pending:
+                            flush_one()
+                        continue
+
+                    for k in ("status", "solution", "objective", "capacity", "used"):
+                        if k not in raw:
+                            raise KeyError(f"Falta clave '{k}' en el resultado del escenario '{name}'")
+
+                    key = chart_key(raw)
+                    if key in inflight:
+                        pending.append((name, raw, key, inflight[key]))
+                        deduplicated += 1
+                    else:
+                        chart = self._read_cache(key)
+                        if chart is not None:
+                            pending.append((name, raw, key, chart))
+                            cached += 1
+                        else:
+                            inflight[key] = pool.submit(_render_chart, raw)
+                            pending.append((name, raw, key, inflight[key]))
+                            rendered += 1
+
+                    while len(pending) > self.max_pending:
+                        flush_one()
+
+                while pending:
+                    flush_one()
+
+                out.write(_FOOTER)
+        except BaseException as e:
+            # No dejar trabajos en vuelo ni el archivo parcial en disco
+            for _, _, _, job in pending:
+                if job is not None and not isinstance(job, str):
+                    job.cancel()
+            if isinstance(e, BrokenProcessPool):
+                _discard_pool(pool)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        os.replace(tmp_path, self.output_path)
+        self._prune_cache()
+        logger.info(
+            f"Reporte generado: {written} escenarios ({rendered} renderizados, "
+            f"{cached} en caché, {deduplicated} duplicados, {failed} con error)"
+        )
+
+        return {
+            "path": self.output_path,
+            "scenarios": written,
+            "rendered": rendered,
+            "cached": cached,
+            "deduplicated": deduplicated,
+            "failed": failed,
+        }
+
+_HEADER = """<!DOCTYPE html>
+<html lang="es">
+<head>
+  <meta charset="UTF-8"/>
+  <title>Revenew ‒ Reporte de Escenarios</title>
+  <style>
+    body { font-family: sans-serif; max-width: 800px; margin: 40px auto; }
+    .scenario { border: 1px solid #ddd; padding: 20px; border-radius: 4px; margin-bottom: 20px; }
+    ul { list-style: none; padding: 0; }
+    .objective { font-weight: bold; }
+    img.chart { display: block; margin: 20px auto; max-width: 100%; }
+    .scenario.error { border-color: #f5c6cb; background: #f8d7da; }
+  </style>
+</head>
+<body>
+<h1>Reporte de Escenarios</h1>
+"""
+
+_FOOTER = """</body>
+</html>
+"""
@@ -15,6 +15,7 @@ class ResultsHandler:
             - objective (float): ingreso total óptimo
             - capacity (Tuple[float, float]): capacidades de las máquinas
             - used (Tuple[float, float]): horas usadas de las máquinas
+            - frontier (Dict[str, Any], opcional): resultado de OptimizationModel.frontier()
 
     Raises:
         KeyError: Si falta alguna de las claves mínimas en el resultado.
@@ -25,6 +26,7 @@ class ResultsHandler:
     Methods:
         get_context() -> Dict[str, Any]: Devuelve un contexto listo para pasar a Django
         get_chart_base64() -> str: Genera y devuelve el gráfico de cantidades como base 64
+        get_frontier_chart_base64() -> str: Genera y devuelve el gráfico de la frontera de Pareto como base 64
     """
 
     def __init__(self, raw: Dict[str, Any]):
@@ -39,13 +41,17 @@ class ResultsHandler:
         """
         Devuelve un contexto listo para pasar a Django
         """
-        return {
+        context = {
             "status": self.raw["status"],
             "solution": self.raw["solution"],
             "objective": self.raw["objective"],
             "capacity": self.raw["capacity"],
             "used": self.raw["used"],
         }
+        if "frontier" in self.raw:
+            context["frontier"] = self.raw["frontier"]["points"]
+            context["frontier_complete"] = self.raw["frontier"].get("complete", True)
+        return context
     
     def get_chart_base64(self) -> str:
         """
@@ -101,6 +107,47 @@ class ResultsHandler:
 
         plt.tight_layout()
 
+        # Guardar la figura en un buffer y codificarla en base64
+        buf = io.BytesIO()
+        plt.savefig(buf, format="png")
+        plt.close(fig)
+        buf.seek(0)
+        return base64.b64encode(buf.read()).decode("ascii")
+
+    def get_frontier_chart_base64(self) -> str:
+        """
+        Genera un gráfico de la frontera de Pareto: ingreso vs. utilización de la máquina 2,
+        con el color de cada punto indicando la utilización de la máquina 1.
+
+        Returns:
+            str: Imagen codificada en base64 lista para ser embebida en HTML.
+
+        Raises:
+            KeyError: Si el resultado no incluye la frontera.
+        """
+        if "frontier" not in self.raw:
+            raise KeyError("Falta clave 'frontier' en el resultado de optimización")
+
+        points = self.raw["frontier"]["points"]
+        revenue = [p["objective"] for p in points]
+        util1 = [100 * p["utilization"][0] for p in points]
+        util2 = [100 * p["utilization"][1] for p in points]
+
+        fig, ax = plt.subplots(figsize=(8, 4))
+
+        # Escalón: mejor ingreso alcanzable para cada límite de uso de M2
+        order = np.argsort(util2)
+        ax.step(np.array(util2)[order], np.maximum.accumulate(np.array(revenue)[order]),
+                where="post", color="gray", alpha=0.5)
+        sc = ax.scatter(util2, revenue, c=util1, cmap="viridis", edgecolor="black", zorder=3)
+        fig.colorbar(sc, ax=ax, label="Uso M1 (%)")
+
+        ax.set_xlabel("Uso M2 (%)")
+        ax.set_ylabel("Ingreso")
+        ax.set_title("Frontera Ingreso vs Uso de Máquinas")
+
+        plt.tight_layout()
+
         # Guardar la figura en un buffer y codificarla en base64
         buf = io.BytesIO()
         plt.savefig(buf, format="png")
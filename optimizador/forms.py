@@ -26,7 +26,8 @@ class ManualParamsForm(forms.Form):
         - time_b_m2: Tiempo del Producto B en la Máquina 2.
         - machine_1: Horas disponibles de la Máquina 1.
         - machine_2: Horas disponibles de la Máquina 2.
-    Todos los campos son obligatorios y deben ser números positivos.
+        - frontier: (Opcional) Calcular la frontera ingreso vs. uso de máquinas.
+    Los campos numéricos son obligatorios y deben ser números positivos.
     """
     price_a = forms.FloatField(label="Precio Producto A", min_value=0)
     price_b = forms.FloatField(label="Precio Producto B", min_value=0)
@@ -36,3 +37,35 @@ class ManualParamsForm(forms.Form):
     time_b_m2 = forms.FloatField(label="Tiempo B en Máquina 2", min_value=0)
     machine_1 = forms.FloatField(label="Horas Máquina 1", min_value=0)
     machine_2 = forms.FloatField(label="Horas Máquina 2", min_value=0)
+
+    frontier = forms.BooleanField(label="Calcular frontera ingreso vs. uso", required=False)
+class MultiPeriodForm(forms.Form):
+    """
+    Formulario para la planificación multiperiodo: cada fila del CSV es un periodo.
+    Campos:
+        - csv_file: Archivo CSV con una fila por periodo.
+        - mode: Horizonte rodante o modelo monolítico.
+        - window: Periodos por ventana (solo horizonte rodante).
+        - step: Periodos fijados por ventana (solo horizonte rodante, 1 <= step <= window).
+        - time_limit: (Opcional) Tiempo máximo del solver por modelo, en segundos.
+    """
+    csv_file = forms.FileField(
+        label="Archivo CSV",
+        validators=[FileExtensionValidator(["csv"])],
+        help_text="Una fila por periodo. Columnas opcionales: Demand_Product_X, Holding_Cost_Product_X"
+    )
+    mode = forms.ChoiceField(
+        label="Modo",
+        choices=[("rolling", "Horizonte rodante"), ("monolithic", "Monolítico")],
+        initial="rolling",
+    )
+    window = forms.IntegerField(label="Periodos por ventana", min_value=1, initial=14)
+    step = forms.IntegerField(label="Periodos fijados por ventana", min_value=1, initial=7)
+    time_limit = forms.FloatField(label="Tiempo máximo del solver (s)", min_value=1, initial=20, required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        window, step = cleaned.get("window"), cleaned.get("step")
+        if window is not None and step is not None and step > window:
+            self.add_error("step", "Debe ser menor o igual que los periodos por ventana")
+        return cleaned
@@ -1,3 +1,308 @@
-from django.test import TestCase
+import os
+import tempfile
+import itertools
+import pandas as pd
+from unittest import mock
+from django.test import SimpleTestCase
+from pulp.constants import LpSolutionIntegerFeasible
 
-# Create your tests here.
+from .core.optimization_model import OptimizationModel
+from .core.results_handler import ResultsHandler
+from .core.monte_carlo import MonteCarloEvaluator, neighbor_plans, evaluate_solution
+from .core.report_builder import BulkReportBuilder, chart_key
+from .core.multi_period_model import MultiPeriodModel
+from .core.data_loader import DataLoader
+
+MULTI_PERIOD_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "multi_period_example.csv")
+
+
+def _row(**overrides):
+    data = {
+        "Product_A_Production_Time_Machine_1": 1.5,
+        "Product_A_Production_Time_Machine_2": 2.0,
+        "Product_B_Production_Time_Machine_1": 1.0,
+        "Product_B_Production_Time_Machine_2": 1.5,
+        "Machine_1_Available_Hours": 8.0,
+        "Machine_2_Available_Hours": 10.0,
+        "Price_Product_A": 100,
+        "Price_Product_B": 80,
+    }
+    data.update(overrides)
+    return pd.DataFrame([data])
+
+
+def _brute_force_frontier(model):
+    """
+    Enumera todos los planes enteros factibles y devuelve los no dominados
+    (max ingreso, min uso M1, min uso M2) como un conjunto de tuplas de cantidades.
+    """
+    # Cota por producto: lo máximo que cabe en la máquina más restrictiva
+    bounds = [
+        int(min(cap / t[p] for cap, t in ((model.cap1, model.time1), (model.cap2, model.time2)) if t[p] > 0))
+        for p in model.products
+    ]
+    plans = []
+    for qty in itertools.product(*(range(b + 1) for b in bounds)):
+        solution = dict(zip(model.products, qty))
+        used1, used2 = model._usage(solution)
+        if used1 <= model.cap1 + 1e-9 and used2 <= model.cap2 + 1e-9:
+            revenue = sum(model.prices[p] * solution[p] for p in model.products)
+            plans.append((qty, revenue, used1, used2))
+
+    def dominates(a, b):
+        return (a[1] >= b[1] and a[2] <= b[2] and a[3] <= b[3]
+                and (a[1] > b[1] or a[2] < b[2] or a[3] < b[3]))
+
+    return {a[0] for a in plans if not any(dominates(b, a) for b in plans)}
+
+
+class FrontierTests(SimpleTestCase):
+
+    def assertMatchesBruteForce(self, df):
+        expected = _brute_force_frontier(OptimizationModel(df))
+        result = OptimizationModel(df).frontier()
+        found = {tuple(p["solution"].values()) for p in result["points"]}
+        self.assertTrue(result["complete"])
+        self.assertEqual(found, expected)
+
+    def test_frontier_matches_brute_force_sample_data(self):
+        self.assertMatchesBruteForce(_row())
+
+    def test_frontier_matches_brute_force_other_instance(self):
+        self.assertMatchesBruteForce(_row(
+            Product_A_Production_Time_Machine_1=2.0,
+            Product_B_Production_Time_Machine_2=0.5,
+            Machine_1_Available_Hours=12.0,
+            Machine_2_Available_Hours=7.0,
+            Price_Product_A=90,
+            Price_Product_B=35,
+        ))
+
+    def test_frontier_answers_capacity_question(self):
+        # Mejor ingreso con M2 <= 85%: A=2, B=3 (440)
+        points = OptimizationModel(_row()).frontier()["points"]
+        best = max(p["objective"] for p in points if p["utilization"][1] <= 0.85)
+        self.assertEqual(best, 440)
+
+    def test_incomplete_frontier_is_flagged_in_context(self):
+        model = OptimizationModel(_row())
+        result = model.solve()
+        result["frontier"] = model.frontier(max_solves=3)
+        self.assertFalse(result["frontier"]["complete"])
+        self.assertFalse(ResultsHandler(result).get_context()["frontier_complete"])
+
+    def test_solve_after_frontier_restores_model(self):
+        model = OptimizationModel(_row())
+        model.frontier()
+        result = model.solve()
+        self.assertEqual(result["solution"], {"A": 2, "B": 4})
+        self.assertEqual(result["objective"], 520)
+
+
+class MonteCarloTests(SimpleTestCase):
+
+    def test_draws_are_non_negative(self):
+        # Coeficientes de variación altos fuerzan muchos rechazos
+        mc = MonteCarloEvaluator(_row(), price_cv=3.0, time_cv=3.0, n_samples=20_000, seed=0)
+        for draws in (mc.prices, mc.time1, mc.time2):
+            self.assertTrue((draws >= 0).all())
+            self.assertEqual(draws.shape, (20_000, 2))
+
+    def test_negative_mean_raises(self):
+        with self.assertRaises(ValueError):
+            MonteCarloEvaluator(_row(Price_Product_A=-5), n_samples=1000, seed=0)
+
+    def test_fixed_seed_is_reproducible(self):
+        a = evaluate_solution(_row(), {"A": 2, "B": 4}, n_samples=10_000, seed=7)
+        b = evaluate_solution(_row(), {"A": 2, "B": 4}, n_samples=10_000, seed=7)
+        self.assertEqual(a, b)
+
+    def test_neighbor_plans(self):
+        plans = neighbor_plans({"A": 2, "B": 0})
+        self.assertEqual(plans, {"optimo": {"A": 2, "B": 0}, "A-1": {"A": 1, "B": 0}})
+
+    def test_robust_plan_is_best_lower_quantile_among_safe_plans(self):
+        mc = MonteCarloEvaluator(_row(), n_samples=50_000, seed=0)
+        result = mc.evaluate(neighbor_plans({"A": 2, "B": 4}), quantiles=(0.95, 0.05, 0.5))
+        self.assertEqual(result["quantiles"], [0.05, 0.5, 0.95])
+
+        plans = result["plans"]
+        # El óptimo usa M2 al 100%: con tiempos inciertos se excede cerca de la mitad de las veces
+        self.assertGreater(plans["optimo"]["overflow_prob"], 0.3)
+        safe = {n: m for n, m in plans.items() if m["overflow_prob"] <= 0.05}
+        expected = max(safe, key=lambda n: safe[n]["quantiles"][0.05])
+        self.assertEqual(result["robust"], expected)
+        self.assertEqual(result["robust"], "B-1")
+
+    def test_robust_plan_without_safe_plans_minimizes_overflow(self):
+        mc = MonteCarloEvaluator(_row(), n_samples=20_000, seed=0)
+        result = mc.evaluate({"full": {"A": 2, "B": 4}, "over": {"A": 4, "B": 4}}, max_overflow=0.0)
+        self.assertEqual(result["robust"], "full")
+
+
+def _result(a, b):
+    return {
+        "status": "Optimal",
+        "solution": {"A": a, "B": b},
+        "objective": 100 * a + 80 * b,
+        "capacity": (8.0, 10.0),
+        "used": (1.5 * a + b, 2.0 * a + 1.5 * b),
+    }
+
+
+class BulkReportBuilderTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output = os.path.join(self.tmp.name, "reporte.html")
+        self.cache_dir = os.path.join(self.tmp.name, "charts")
+
+    def builder(self):
+        return BulkReportBuilder(self.output, max_workers=1, cache_dir=self.cache_dir)
+
+    def test_second_build_reads_charts_from_cache(self):
+        scenarios = [("S1", _result(2, 4)), ("S2", _result(1, 3))]
+        first = self.builder().build(scenarios)
+        self.assertEqual((first["rendered"], first["cached"]), (2, 0))
+
+        second = self.builder().build(scenarios)
+        self.assertEqual((second["rendered"], second["cached"]), (0, 2))
+        with open(self.output, encoding="utf-8") as f:
+            self.assertEqual(f.read().count('<section class="scenario">'), 2)
+
+    def test_in_flight_duplicates_are_rendered_once(self):
+        result = self.builder().build([(f"S{i}", _result(2, 4)) for i in range(3)])
+        self.assertEqual(result["scenarios"], 3)
+        self.assertEqual(result["rendered"], 1)
+        self.assertEqual(result["deduplicated"], 2)
+        self.assertEqual(result["cached"], 0)
+
+    def test_invalid_cached_chart_is_discarded(self):
+        raw = _result(2, 4)
+        os.makedirs(self.cache_dir)
+        with open(os.path.join(self.cache_dir, f"{chart_key(raw)}.b64"), "w") as f:
+            f.write('"><script>alert(1)</script>')
+
+        result = self.builder().build([("S1", raw)])
+        self.assertEqual((result["rendered"], result["cached"]), (1, 0))
+        with open(self.output, encoding="utf-8") as f:
+            self.assertNotIn("<script>", f.read())
+
+    def test_partial_file_is_removed_when_scenarios_raise(self):
+        def scenarios():
+            yield "S1", _result(2, 4)
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.builder().build(scenarios())
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(f"{self.output}.tmp"))
+
+    def test_failed_scenario_is_written_as_error_section(self):
+        result = self.builder().build([("S1", {"error": "Solver <Infeasible>"}), ("S2", _result(1, 3))])
+        self.assertEqual((result["scenarios"], result["failed"], result["rendered"]), (2, 1, 1))
+        with open(self.output, encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("Solver &lt;Infeasible&gt;", content)
+
+
+class MultiPeriodModelTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.df = DataLoader(MULTI_PERIOD_CSV).load()
+
+    def test_rolling_plan_respects_balance_and_capacity(self):
+        model = MultiPeriodModel(self.df)
+        result = model.solve("rolling", window=7, step=3)
+        self.assertEqual([p["period"] for p in result["plan"]], list(range(model.periods)))
+        # Ventanas en 0, 3, ..., 24; la última llega al final y fija todo lo restante
+        self.assertEqual(result["solves"], 9)
+        self.assertFalse(result["proven_optimal"])
+
+        previous = model.initial_inventory
+        for period in result["plan"]:
+            t = period["period"]
+            for p in model.products:
+                # Balance de inventario, también entre ventanas fijadas por separado
+                expected = previous[p] + period["production"][p] - period["sales"][p]
+                self.assertAlmostEqual(period["inventory"][p], expected, places=6)
+                self.assertGreaterEqual(period["inventory"][p], -1e-9)
+                self.assertLessEqual(period["sales"][p], model.demand[p][t] + 1e-9)
+            self.assertLessEqual(period["used"][0], model.cap1[t] + 1e-9)
+            self.assertLessEqual(period["used"][1], model.cap2[t] + 1e-9)
+            previous = period["inventory"]
+
+    def test_rolling_with_full_window_matches_monolithic(self):
+        model = MultiPeriodModel(self.df)
+        monolithic = model.solve("monolithic")
+        self.assertTrue(monolithic["proven_optimal"])
+        self.assertEqual(monolithic["status"], "Optimal")
+        for window in (model.periods, model.periods + 10):
+            rolling = model.solve("rolling", window=window, step=7)
+            self.assertEqual(rolling["solves"], 1)
+            self.assertAlmostEqual(rolling["objective"], monolithic["objective"], places=6)
+
+    def test_invalid_window_parameters_raise(self):
+        model = MultiPeriodModel(self.df)
+        for window, step in ((7, 0), (7, 8), (0, 0)):
+            with self.assertRaises(ValueError):
+                model.solve("rolling", window=window, step=step)
+        with self.assertRaises(ValueError):
+            model.solve("otro")
+
+    def test_gap_is_none_when_baseline_not_proven_optimal(self):
+        model = MultiPeriodModel(self.df)
+        original = MultiPeriodModel._solve_window
+
+        def not_proven(self, start, end, *args, **kwargs):
+            result = original(self, start, end, *args, **kwargs)
+            if start == 0 and end == self.periods:
+                result["sol_status"] = LpSolutionIntegerFeasible
+            return result
+
+        with mock.patch.object(MultiPeriodModel, "_solve_window", not_proven):
+            gap = model.optimality_gap(window=14, step=7)
+        self.assertFalse(gap["baseline_optimal"])
+        self.assertFalse(gap["monolithic"]["proven_optimal"])
+        self.assertEqual(gap["monolithic"]["solution_status"], "Solution Found")
+        self.assertIsNone(gap["gap"])
+        self.assertIsNotNone(gap["incumbent_gap"])
+
+    def test_gap_with_proven_baseline(self):
+        gap = MultiPeriodModel(self.df).optimality_gap(window=7, step=3)
+        self.assertTrue(gap["baseline_optimal"])
+        self.assertGreaterEqual(gap["gap"], 0.0)
+        self.assertEqual(gap["gap"], gap["incumbent_gap"])
+
+
+class MultiPeriodViewTests(SimpleTestCase):
+
+    def test_view_plans_uploaded_csv(self):
+        with open(MULTI_PERIOD_CSV, "rb") as f:
+            response = self.client.post("/multiperiodo/", {
+                "csv_file": f, "mode": "rolling", "window": 14, "step": 7, "time_limit": 20,
+            })
+        self.assertEqual(response.status_code, 200)
+        result = response.context["result"]
+        self.assertEqual(len(result["plan"]), 30)
+        # Ventanas en 0, 7, 14 y 21; la última llega al final
+        self.assertEqual(result["solves"], 4)
+
+    def test_step_larger_than_window_is_rejected(self):
+        with open(MULTI_PERIOD_CSV, "rb") as f:
+            response = self.client.post("/multiperiodo/", {
+                "csv_file": f, "mode": "rolling", "window": 3, "step": 7,
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("step", response.context["form"].errors)
+        self.assertNotIn("result", response.context)
+
+    def test_upload_warns_about_extra_rows(self):
+        with open(MULTI_PERIOD_CSV, "rb") as f:
+            response = self.client.post("/upload/", {"csv_file": f})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["multi_row"], 30)
+        self.assertContains(response, "Planificación Multiperiodo")
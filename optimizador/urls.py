@@ -1,9 +1,11 @@
 from django.urls import path
-from .views import index, upload_view, manual_view, test_view
+from .views import index, upload_view, manual_view, test_view, report_view, multi_period_view
 
 urlpatterns = [
     path('', index, name='index'),
     path('upload/', upload_view, name='upload'),
     path('manual/', manual_view, name='manual'),
     path('prueba/', test_view, name='prueba'),
+    path('reporte/', report_view, name='reporte'),
+    path('multiperiodo/', multi_period_view, name='multiperiodo'),
 ]
\ No newline at end of file
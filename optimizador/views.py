@@ -1,13 +1,23 @@
+from django.conf import settings
 from django.shortcuts import render
-from .forms import UploadForm, ManualParamsForm
+from django.http import FileResponse
+from .forms import UploadForm, ManualParamsForm, MultiPeriodForm
 from .core.data_loader import DataLoader
 from .core.optimization_model import OptimizationModel
+from .core.multi_period_model import MultiPeriodModel
 from .core.results_handler import ResultsHandler
+from .core.monte_carlo import evaluate_solution
+from .core.report_builder import BulkReportBuilder
 import pandas as pd
+import tempfile
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Semilla fija para que la tabla de robustez sea reproducible para una misma entrada
+MONTE_CARLO_SEED = 42
+
 # Create your views here.
 def index(request):
     """
@@ -52,9 +62,17 @@ def upload_view(request):
 
             # Agregar gráfico
             context["chart"] = rh.get_chart_base64()
+            # Evaluación Monte Carlo del plan óptimo bajo incertidumbre
+            try:
+                context["robustness"] = evaluate_solution(df, result["solution"], seed=MONTE_CARLO_SEED)
+            except Exception as e:
+                logger.warning(f"No se pudo ejecutar la evaluación Monte Carlo: {e}")
             # mostrar capacidades en la plantilla
             context["capacity1"] = df.iloc[0]["Machine_1_Available_Hours"]
             context["capacity2"] = df.iloc[0]["Machine_2_Available_Hours"]
+            # Avisar que solo se optimizó la primera fila de un CSV con varios periodos
+            if len(df) > 1:
+                context["multi_row"] = len(df)
             logger.info("Contexto preparado para la plantilla de resultados")
 
             # Renderizamos la plantilla de resultados
@@ -91,12 +109,21 @@ def manual_view(request):
 
             # Ejecutar la optimización
             try:
-                result = OptimizationModel(df).solve()
+                model = OptimizationModel(df)
+                result = model.solve()
                 logger.info(f"Optimización ejecutada con estado {result['status']}")
             except Exception as e:
                 logger.error(f"Error al ejecutar la optimización: {e}")
                 form.add_error(None, "Error al ejecutar la optimización. Verifique los datos del CSV.")
                 return render(request, "optimizador/manual.html", {'form': form})
+
+            # Frontera ingreso vs. uso, reutilizando el modelo ya construido
+            if form.cleaned_data['frontier']:
+                try:
+                    result["frontier"] = model.frontier(time_budget=settings.FRONTIER_TIME_BUDGET)
+                    logger.info(f"Frontera calculada con {len(result['frontier']['points'])} puntos")
+                except Exception as e:
+                    logger.warning(f"No se pudo calcular la frontera: {e}")
             
             # Preparamos el contexto para la plantilla
             rh = ResultsHandler(result)
@@ -104,6 +131,13 @@ def manual_view(request):
 
             # Agregar gráfico
             context["chart"] = rh.get_chart_base64()
+            if "frontier" in result:
+                context["frontier_chart"] = rh.get_frontier_chart_base64()
+            # Evaluación Monte Carlo del plan óptimo bajo incertidumbre
+            try:
+                context["robustness"] = evaluate_solution(df, result["solution"], seed=MONTE_CARLO_SEED)
+            except Exception as e:
+                logger.warning(f"No se pudo ejecutar la evaluación Monte Carlo: {e}")
             # mostrar capacidades en la plantilla
             context["capacity1"] = df.iloc[0]["Machine_1_Available_Hours"]
             context["capacity2"] = df.iloc[0]["Machine_2_Available_Hours"]
@@ -145,6 +179,11 @@ def test_view(request):
 
     # Agregar gráfico
     context["chart"] = rh.get_chart_base64()
+    # Evaluación Monte Carlo del plan óptimo bajo incertidumbre
+    try:
+        context["robustness"] = evaluate_solution(df, result["solution"], seed=MONTE_CARLO_SEED)
+    except Exception as e:
+        logger.warning(f"No se pudo ejecutar la evaluación Monte Carlo: {e}")
     # mostrar capacidades en la plantilla
     context["capacity1"] = df.iloc[0]["Machine_1_Available_Hours"]
     context["capacity2"] = df.iloc[0]["Machine_2_Available_Hours"]
@@ -152,4 +191,98 @@ def test_view(request):
     logger.info("Contexto preparado para la plantilla de resultados de prueba")
 
     # Renderizamos la plantilla de resultados
-    return render(request, "optimizador/results.html", context)
\ No newline at end of file
+    return render(request, "optimizador/results.html", context)
+
+def report_view(request):
+    """
+    Vista para generar un reporte con muchos escenarios.
+    Cada fila del CSV se optimiza por separado y se descarga un único reporte HTML.
+    """
+    if request.method == "POST":
+        form = UploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            # Cargamos el DataFrame
+            try:
+                df = DataLoader(form.cleaned_data["csv_file"]).load()
+                logger.info(f"Dataframe cargado correctamente con {len(df)} escenarios")
+            except Exception as e:
+                logger.error(f"Error al cargar el DataFrame: {e}")
+                form.add_error("csv_file", str(e))
+                return render(request, "optimizador/report.html", {'form': form})
+
+            # Los escenarios se optimizan a medida que el reporte los consume; un escenario que
+            # falla se informa en su propia sección sin abortar el reporte
+            def scenarios():
+                for i in range(len(df)):
+                    name = f"Escenario {i + 1}"
+                    try:
+                        result = OptimizationModel(df.iloc[[i]]).solve()
+                    except Exception as e:
+                        logger.warning(f"Error al optimizar {name}: {e}")
+                        result = {"error": str(e)}
+                    yield name, result
+
+            # Generar el reporte en disco, reutilizando gráficos de resultados sin cambios
+            fd, path = tempfile.mkstemp(suffix=".html", prefix="reporte_")
+            os.close(fd)
+            builder = BulkReportBuilder(
+                path,
+                cache_dir=str(settings.REPORT_CACHE_DIR),
+                cache_max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+                cache_max_age=settings.REPORT_CACHE_MAX_AGE,
+            )
+            try:
+                builder.build(scenarios())
+            except Exception as e:
+                logger.error(f"Error al generar el reporte: {e}")
+                os.remove(path)
+                form.add_error(None, "Error al generar el reporte. Verifique los datos del CSV.")
+                return render(request, "optimizador/report.html", {'form': form})
+
+            # Abrimos el archivo y lo eliminamos del disco; se libera al cerrar la respuesta
+            report = open(path, "rb")
+            os.remove(path)
+            return FileResponse(report, as_attachment=True, filename="reporte_escenarios.html")
+    else:
+        form = UploadForm()
+
+    return render(request, "optimizador/report.html", {'form': form})
+
+def multi_period_view(request):
+    """
+    Vista para la planificación multiperiodo.
+    Cada fila del CSV es un periodo, enlazado con el siguiente por el inventario.
+    """
+    context = {}
+    if request.method == "POST":
+        form = MultiPeriodForm(request.POST, request.FILES)
+        if form.is_valid():
+            # Cargamos el DataFrame
+            try:
+                df = DataLoader(form.cleaned_data["csv_file"]).load()
+                logger.info(f"Dataframe cargado correctamente con {len(df)} periodos")
+            except Exception as e:
+                logger.error(f"Error al cargar el DataFrame: {e}")
+                form.add_error("csv_file", str(e))
+                return render(request, "optimizador/multi_period.html", {'form': form})
+
+            # Ejecutar la planificación
+            try:
+                result = MultiPeriodModel(df).solve(
+                    form.cleaned_data["mode"],
+                    window=form.cleaned_data["window"],
+                    step=form.cleaned_data["step"],
+                    time_limit=form.cleaned_data["time_limit"],
+                )
+                logger.info(f"Planificación multiperiodo ejecutada con estado {result['solution_status']}")
+            except Exception as e:
+                logger.error(f"Error al ejecutar la planificación multiperiodo: {e}")
+                form.add_error(None, "Error al ejecutar la planificación. Verifique los datos del CSV.")
+                return render(request, "optimizador/multi_period.html", {'form': form})
+
+            context["result"] = result
+    else:
+        form = MultiPeriodForm()
+
+    context["form"] = form
+    return render(request, "optimizador/multi_period.html", context)
@@ -139,6 +139,14 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Caché de gráficos del reporte de escenarios (carpeta propia de la app, con límites)
+REPORT_CACHE_DIR = BASE_DIR / 'cache' / 'charts'
+REPORT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+REPORT_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Tiempo máximo (segundos) del cálculo de la frontera en la vista manual, bajo el timeout de gunicorn
+FRONTIER_TIME_BUDGET = 10
+
 # Configuración de logging
 import logging
 